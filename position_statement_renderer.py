@@ -1,11 +1,18 @@
+import asyncio
+import functools
 import json
+import logging
+import os
 import re
+import shlex
 import subprocess
 import uuid
 from collections.abc import Mapping
 from dataclasses import dataclass
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 
 LATEX_SPECIAL_CHARS = {
     "\\": r"\textbackslash{}",
@@ -20,6 +27,14 @@ LATEX_SPECIAL_CHARS = {
     "^": r"\textasciicircum{}",
 }
 
+# Precomputed table so escape_latex runs as a single C-level translate pass.
+_LATEX_TRANS = str.maketrans(LATEX_SPECIAL_CHARS)
+
+# Fused table: escapes LaTeX specials and converts newlines to LaTeX line
+# breaks in the same pass (carriage returns are dropped so \r\n collapses
+# to a single break).
+_LATEX_NL_TRANS = str.maketrans({**LATEX_SPECIAL_CHARS, "\n": "\\\\ ", "\r": ""})
+
 PLACEHOLDER_NAMES = (
     "CHILD_NAME",
     "PARENT_NAME",
@@ -28,10 +43,13 @@ PLACEHOLDER_NAMES = (
     "EXCLUSION_LETTER_DATE",
     "STAGE",
 )
-BRACKET_PLACEHOLDER_PATTERN = re.compile(r"\[(" + "|".join(PLACEHOLDER_NAMES) + r")\]")
-ANGLE_PLACEHOLDER_PATTERN = re.compile(r"<<(" + "|".join(PLACEHOLDER_NAMES) + r")>>")
-AT_PLACEHOLDER_PATTERN = re.compile(r"@@(" + "|".join(PLACEHOLDER_NAMES) + r")@@")
+COMBINED_PLACEHOLDER_PATTERN = re.compile(
+    r"\[(" + "|".join(PLACEHOLDER_NAMES) + r")\]"
+    r"|<<(" + "|".join(PLACEHOLDER_NAMES) + r")>>"
+    r"|@@(" + "|".join(PLACEHOLDER_NAMES) + r")@@"
+)
 OPENING_SINGLE_QUOTE_PATTERN = re.compile(r"(^|[\s(\[{<])'(?=\S)")
+TEMPLATE_PLACEHOLDER_PATTERN = re.compile(r"@@(\w+)@@")
 
 
 def fix_opening_single_quotes(text):
@@ -53,13 +71,7 @@ def escape_latex(value):
     """Escape LaTeX special characters in the provided string."""
     if value is None:
         return ""
-    escaped = []
-    for char in value:
-        if char in LATEX_SPECIAL_CHARS:
-            escaped.append(LATEX_SPECIAL_CHARS[char])
-        else:
-            escaped.append(char)
-    return "".join(escaped)
+    return value.translate(_LATEX_TRANS)
 
 
 def replace_newlines(value):
@@ -67,18 +79,25 @@ def replace_newlines(value):
     return value.replace("\r\n", "\n").replace("\r", "\n").replace("\n", r"\\ ")
 
 
+def escape_latex_with_newlines(value):
+    """Escape LaTeX specials and convert newlines to line breaks in one pass."""
+    if value is None:
+        return ""
+    return value.translate(_LATEX_NL_TRANS)
+
+
 def resolve_placeholders(text, values):
     """Replace placeholder tokens such as [CHILD_NAME] or <<CHILD_NAME>>."""
+    # Most strings carry no placeholder at all; a substring check is far
+    # cheaper than running the regexes over the common case.
+    if "[" not in text and "<<" not in text and "@@" not in text:
+        return text
 
     def replace_match(match):
-        placeholder = match.group(1)
-        replacement = values.get(placeholder) or ""
-        return replacement
+        placeholder = match.group(1) or match.group(2) or match.group(3)
+        return values.get(placeholder) or ""
 
-    text = BRACKET_PLACEHOLDER_PATTERN.sub(replace_match, text)
-    text = ANGLE_PLACEHOLDER_PATTERN.sub(replace_match, text)
-    text = AT_PLACEHOLDER_PATTERN.sub(replace_match, text)
-    return text
+    return COMBINED_PLACEHOLDER_PATTERN.sub(replace_match, text)
 
 
 def extract_json_from_response(raw_response):
@@ -97,64 +116,53 @@ def extract_json_from_response(raw_response):
         return json.loads(json_text)
     except json.JSONDecodeError as exc:
         # If parsing fails, try to fix common issues
-        print(f"JSON parsing failed: {exc}")
-        print(f"Raw JSON text (first 500 chars): {json_text[:500]}")
-        
+        logger.warning("JSON parsing failed: %s", exc)
+        logger.debug("Raw JSON text (first 500 chars): %s", json_text[:500])
+
         # Try to fix common JSON issues
         fixed_json = _attempt_json_fixes(json_text)
         if fixed_json != json_text:
-            print("Attempting to fix JSON issues...")
+            logger.debug("Attempting to fix JSON issues...")
             try:
                 return json.loads(fixed_json)
             except json.JSONDecodeError as fixed_exc:
-                print(f"Fixed JSON still failed: {fixed_exc}")
+                logger.warning("Fixed JSON still failed: %s", fixed_exc)
         
         # If all else fails, show the problematic JSON for debugging
         raise ValueError(f"Unable to parse JSON position statement: {exc}\n\nRaw JSON text:\n{json_text}")
 
 
+# Heuristic repairs for malformed LLM JSON, compiled once and applied in
+# order. The missing-comma cases share one alternation pattern so the text
+# is scanned once instead of three times.
+_JSON_FIX_PATTERNS = (
+    # Missing comma between consecutive objects in an array.
+    (re.compile(r'}\s*\n\s*{'), '},\n{'),
+    # Missing comma between a property value (or bare string) and the next
+    # quoted key/string on the following line.
+    (re.compile(r'("\s*:\s*[^,}\]]+|"\s*)\s*\n\s*(")'), r'\1,\n\2'),
+    # Trailing commas before closing braces/brackets.
+    (re.compile(r',(\s*[}\]])'), r'\1'),
+    # Missing quotes around keys (basic cases). The lookbehind stops the rule
+    # firing just after an opening quote, e.g. on "http:..." string values.
+    (re.compile(r'(?<!")\b(\w+)\s*:'), r'"\1":'),
+)
+
+
 def _attempt_json_fixes(json_text):
     """Attempt to fix common JSON issues in LLM-generated JSON."""
     fixed = json_text
-    
-    # Fix missing commas between array elements
-    # Look for patterns like "}" followed by "{" without a comma
-    fixed = re.sub(r'}\s*\n\s*{', '},\n{', fixed)
-    
-    # Fix missing commas between object properties
-    # Look for patterns like '"key": value' followed by '"key": value' without comma
-    fixed = re.sub(r'("\s*:\s*[^,}\]]+)\s*\n\s*(")', r'\1,\n\2', fixed)
-    
-    # Fix specific comma delimiter issues - look for missing commas before closing quotes
-    # Pattern: "value" followed by "key" without comma
-    fixed = re.sub(r'("\s*)\n\s*(")', r'\1,\n\2', fixed)
-    
-    # Fix missing commas after string values in arrays/objects
-    # Pattern: "string" followed by "string" without comma
-    fixed = re.sub(r'("\s*)\s*\n\s*(")', r'\1,\n\2', fixed)
-    
-    # Fix trailing commas before closing braces/brackets
-    fixed = re.sub(r',(\s*[}\]])', r'\1', fixed)
-    
-    # Fix missing quotes around keys (basic cases)
-    fixed = re.sub(r'(\w+)\s*:', r'"\1":', fixed)
-    
+    for pattern, replacement in _JSON_FIX_PATTERNS:
+        fixed = pattern.sub(replacement, fixed)
     return fixed
 
 
-def _format_ground_titles(grounds, placeholder_values):
-    items = []
-    for ground in grounds:
-        title = ground.get("ground_title", "")
-        resolved_title = resolve_placeholders(title, placeholder_values)
-        normalized_title = fix_opening_single_quotes(resolved_title)
-        escaped_title = replace_newlines(escape_latex(normalized_title))
-        items.append(f"\\item {escaped_title}")
-    return "\n".join(items)
-
-
-def _format_ground_content(grounds, placeholder_values):
-    sections = []
+def _format_grounds(grounds, placeholder_values):
+    """Build the titles list and the section content in one pass over grounds."""
+    title_items = []
+    # All content lines accumulate here and are joined exactly once at the
+    # end; an empty entry yields the blank line between sections.
+    content_parts = []
     for idx, ground in enumerate(grounds):
         number = ground.get("ground_number")
         title = ground.get("ground_title", "")
@@ -162,7 +170,8 @@ def _format_ground_content(grounds, placeholder_values):
 
         resolved_title = resolve_placeholders(title, placeholder_values)
         normalized_title = fix_opening_single_quotes(resolved_title)
-        escaped_title = replace_newlines(escape_latex(normalized_title))
+        escaped_title = escape_latex_with_newlines(normalized_title)
+        title_items.append(f"\\item {escaped_title}")
         heading = f"\\section*{{\\raggedright Ground {number}: {escaped_title}}}"
 
         enumerate_options = (
@@ -171,7 +180,12 @@ def _format_ground_content(grounds, placeholder_values):
             else "[label=\\arabic*., leftmargin=6ex, resume*=main]"
         )
 
-        bullet_lines = []
+        if idx:
+            content_parts.append("")
+        content_parts.append(heading)
+        content_parts.append(f"\\begin{{enumerate}}{enumerate_options}")
+
+        has_bullet_lines = False
         for bullet in bullets:
             if isinstance(bullet, Mapping):
                 bullet_data = bullet
@@ -196,42 +210,39 @@ def _format_ground_content(grounds, placeholder_values):
                     resolved_content = f"``{resolved_content}''"
 
             resolved_content = fix_opening_single_quotes(resolved_content)
-            escaped_content = replace_newlines(escape_latex(resolved_content))
+            escaped_content = escape_latex_with_newlines(resolved_content)
             line = escaped_content
 
             if reference:
                 resolved_reference = resolve_placeholders(reference, placeholder_values)
                 resolved_reference = fix_opening_single_quotes(resolved_reference)
-                escaped_reference = replace_newlines(escape_latex(resolved_reference))
+                escaped_reference = escape_latex_with_newlines(resolved_reference)
                 line = f"{line} {escaped_reference}"
 
             if not line:
                 line = " "
 
-            bullet_lines.append(f"\\item {line}")
-
-        if not bullet_lines:
-            bullet_lines.append("\\item ")
-
-        bullet_block = "\n".join(bullet_lines)
-        sections.append(
-            "\n".join(
-                [
-                    heading,
-                    f"\\begin{{enumerate}}{enumerate_options}",
-                    bullet_block,
-                    "\\end{enumerate}",
-                ]
-            )
-        )
+            content_parts.append(f"\\item {line}")
+            has_bullet_lines = True
+
+        if not has_bullet_lines:
+            content_parts.append("\\item ")
+
+        content_parts.append("\\end{enumerate}")
+
+    return "\n".join(title_items), "\n".join(content_parts)
+
 
-    return "\n\n".join(sections)
+@functools.lru_cache(maxsize=8)
+def _load_template_cached(path_str, mtime):
+    # mtime participates in the cache key so edits invalidate the entry.
+    return Path(path_str).read_text(encoding="utf-8")
 
 
 def _load_template(template_path):
     if not template_path.exists():
         raise FileNotFoundError(f"Template not found: {template_path}")
-    return template_path.read_text(encoding="utf-8")
+    return _load_template_cached(str(template_path.resolve()), template_path.stat().st_mtime)
 
 
 def _write_tex_file(tex_content, output_dir, stem):
@@ -241,21 +252,32 @@ def _write_tex_file(tex_content, output_dir, stem):
     return tex_path
 
 
-def _compile_tex_to_pdf(tex_path, output_dir):
-    command = [
-        "pdflatex",
-        "-interaction=nonstopmode",
-        "-halt-on-error",
+# The compiler invocation can be overridden via VOX_LATEX_COMMAND — e.g.
+# "pdflatex -fmt=ps_custom" to use a precompiled format file, or "latexmk
+# -pdf -f" — as long as the tool accepts pdflatex-style output-directory
+# options. The default matches the TeX Live install from packages.txt.
+_LATEX_COMMAND = shlex.split(os.environ.get("VOX_LATEX_COMMAND", "")) or [
+    "pdflatex",
+    "-interaction=nonstopmode",
+    "-halt-on-error",
+]
+
+
+def _pdflatex_command(tex_path, output_dir):
+    return _LATEX_COMMAND + [
         "-output-directory",
         str(output_dir),
         str(tex_path),
     ]
-    result = subprocess.run(command, capture_output=True, text=True, check=False)
 
-    log_path = output_dir / f"{tex_path.stem}.log"
-    log_path.write_text(result.stdout + "\n" + result.stderr, encoding="utf-8")
 
-    if result.returncode != 0:
+def _check_compile_result(returncode, stdout, stderr, tex_path, output_dir):
+    # pdflatex already writes its own log at this path; only overwrite it with
+    # the captured output when compilation fails, so the success path skips
+    # the redundant re-write.
+    log_path = output_dir / f"{tex_path.stem}.log"
+    if returncode != 0:
+        log_path.write_text(stdout + "\n" + stderr, encoding="utf-8")
         raise RuntimeError(
             f"LaTeX compilation failed. Review the log at: {log_path}"
         )
@@ -267,12 +289,38 @@ def _compile_tex_to_pdf(tex_path, output_dir):
     return pdf_path, log_path
 
 
-def render_position_statement_pdf(
-    position_statement,
-    user_details,
-    template_path=Path("documents/position_statement_output_template.tex"),
-    output_dir=Path("output") / "position_statements",
-):
+def _compile_tex_to_pdf(tex_path, output_dir):
+    command = _pdflatex_command(tex_path, output_dir)
+    result = subprocess.run(command, capture_output=True, text=True, check=False)
+    return _check_compile_result(result.returncode, result.stdout, result.stderr, tex_path, output_dir)
+
+
+# pdflatex is CPU-bound, so running more than a couple of instances at once
+# just thrashes; the semaphore gives concurrent async renders back-pressure.
+_MAX_CONCURRENT_PDFLATEX = 2
+_pdflatex_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_PDFLATEX)
+
+
+async def _compile_tex_to_pdf_async(tex_path, output_dir):
+    command = _pdflatex_command(tex_path, output_dir)
+    async with _pdflatex_semaphore:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate()
+    return _check_compile_result(
+        process.returncode,
+        stdout.decode("utf-8", errors="replace"),
+        stderr.decode("utf-8", errors="replace"),
+        tex_path,
+        output_dir,
+    )
+
+
+def _prepare_tex_file(position_statement, user_details, template_path, output_dir):
+    """Fill the template and write the .tex source ready for compilation."""
     template_text = _load_template(template_path)
 
     placeholder_values = {
@@ -284,52 +332,57 @@ def render_position_statement_pdf(
         "STAGE": user_details.get("stage") or "",
     }
     
-    # Debug output to help identify placeholder substitution issues
-    print("=== PLACEHOLDER SUBSTITUTION DEBUG ===")
-    print(f"User details received: {user_details}")
-    print(f"Placeholder values: {placeholder_values}")
-    for key, value in placeholder_values.items():
-        if not value:
-            print(f"WARNING: {key} is empty!")
+    # Debug output to help identify placeholder substitution issues; the
+    # level check skips the scan entirely on the production path.
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("User details received: %s", user_details)
+        logger.debug("Placeholder values: %s", placeholder_values)
+        for key, value in placeholder_values.items():
+            if not value:
+                logger.debug("Placeholder %s is empty", key)
 
     escaped_placeholders = {
-        key: replace_newlines(escape_latex(fix_opening_single_quotes(value)))
+        key: escape_latex_with_newlines(fix_opening_single_quotes(value))
         for key, value in placeholder_values.items()
     }
 
     grounds = position_statement.get("grounds", [])
-    grounds_titles = _format_ground_titles(grounds, placeholder_values)
-    grounds_content = _format_ground_content(grounds, placeholder_values)
-
-    replacements = {
-        "@@CHILD_NAME@@": escaped_placeholders["CHILD_NAME"],
-        "@@PARENT_NAME@@": escaped_placeholders["PARENT_NAME"],
-        "@@SCHOOL_NAME@@": escaped_placeholders["SCHOOL_NAME"],
-        "@@STAGE@@": escaped_placeholders["STAGE"],
-        "@@EXCLUSION_DATE@@": escaped_placeholders["EXCLUSION_DATE"],
-        "@@EXCLUSION_LETTER_DATE@@": escaped_placeholders["EXCLUSION_LETTER_DATE"],
-        "@@GROUNDS_TITLES@@": grounds_titles,
-        "@@GROUNDS_CONTENT@@": grounds_content,
-    }
+    grounds_titles, grounds_content = _format_grounds(grounds, placeholder_values)
 
-    tex_content = template_text
-    for placeholder, value in replacements.items():
-        tex_content = tex_content.replace(placeholder, value)
-    
-    # Debug: Check if any placeholders remain
+    replacements = dict(escaped_placeholders)
+    replacements["GROUNDS_TITLES"] = grounds_titles
+    replacements["GROUNDS_CONTENT"] = grounds_content
+
+    # One scan over the template instead of one full copy per placeholder.
+    # Tokens without a replacement are left in place and reported, so the
+    # separate "remaining placeholders" re-scan is no longer needed.
     remaining_placeholders = []
-    for placeholder in ["@@CHILD_NAME@@", "@@PARENT_NAME@@", "@@SCHOOL_NAME@@", 
-                       "@@EXCLUSION_DATE@@", "@@EXCLUSION_LETTER_DATE@@", "@@STAGE@@"]:
-        if placeholder in tex_content:
-            remaining_placeholders.append(placeholder)
-    
+
+    def substitute(match):
+        value = replacements.get(match.group(1))
+        if value is None:
+            remaining_placeholders.append(match.group(0))
+            return match.group(0)
+        return value
+
+    tex_content = TEMPLATE_PLACEHOLDER_PATTERN.sub(substitute, template_text)
+
     if remaining_placeholders:
-        print(f"ERROR: Placeholders not substituted: {remaining_placeholders}")
+        logger.warning("Placeholders not substituted: %s", remaining_placeholders)
     else:
-        print("SUCCESS: All placeholders successfully substituted")
+        logger.debug("All placeholders successfully substituted")
 
     unique_stem = f"position_statement_{uuid.uuid4().hex[:8]}"
-    tex_path = _write_tex_file(tex_content, output_dir, unique_stem)
+    return _write_tex_file(tex_content, output_dir, unique_stem)
+
+
+def render_position_statement_pdf(
+    position_statement,
+    user_details,
+    template_path=Path("documents/position_statement_output_template.tex"),
+    output_dir=Path("output") / "position_statements",
+):
+    tex_path = _prepare_tex_file(position_statement, user_details, template_path, output_dir)
     pdf_path, log_path = _compile_tex_to_pdf(tex_path, output_dir)
 
     return RenderedPositionStatement(
@@ -338,3 +391,21 @@ def render_position_statement_pdf(
         pdf_path=pdf_path,
         log_path=log_path,
     )
+
+
+async def render_position_statement_pdf_async(
+    position_statement,
+    user_details,
+    template_path=Path("documents/position_statement_output_template.tex"),
+    output_dir=Path("output") / "position_statements",
+):
+    """Async variant: concurrent renders overlap pdflatex with other I/O."""
+    tex_path = _prepare_tex_file(position_statement, user_details, template_path, output_dir)
+    pdf_path, log_path = await _compile_tex_to_pdf_async(tex_path, output_dir)
+
+    return RenderedPositionStatement(
+        json_payload=position_statement,
+        tex_path=tex_path,
+        pdf_path=pdf_path,
+        log_path=log_path,
+    )
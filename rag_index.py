@@ -1,10 +1,62 @@
+import functools
+import hashlib
 import json
 import math
+import pickle
 import re
+import sys
 from collections import Counter
 from dataclasses import dataclass
 from pathlib import Path
-@dataclass
+
+try:
+    import numpy as np
+    from scipy import sparse
+    HAS_SCIPY = True
+except ImportError:  # pragma: no cover
+    HAS_SCIPY = False
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover
+    _loads = json.loads
+
+# Bump when the persisted index layout changes so stale caches rebuild.
+INDEX_CACHE_VERSION = 3
+
+# Derived index state persisted to (and restored from) the on-disk cache.
+_INDEX_CACHE_ATTRIBUTES = (
+    "_doc_freq",
+    "_idf",
+    "_vocab",
+    "_vectors",
+    "_norms",
+    "_postings",
+    "_matrix",
+    "_norm_array",
+)
+def _count_tokens(tokens):
+    """Term-frequency dict; a plain dict increment beats Counter's dispatch."""
+    tf = {}
+    for token in tokens:
+        tf[token] = tf.get(token, 0) + 1
+    return tf
+
+
+@functools.lru_cache(maxsize=256)
+def _tokenise_query(text):
+    """Tokenise a query once per distinct string.
+
+    Tokenisation is index-independent, so when the same query is searched
+    against both guidance indices the second search reuses this result."""
+    return tuple(
+        sys.intern(token)
+        for token in LocalTfIdfIndex.TOKEN_PATTERN.findall(text.lower())
+    )
+
+
+@dataclass(slots=True)
 class Chunk:
     """Primitive chunk record loaded from JSONL."""
     id: str
@@ -12,11 +64,11 @@ class Chunk:
     text: str
     metadata: dict
     order: int
-@dataclass
+@dataclass(slots=True)
 class ScoredChunk:
     chunk: Chunk
     score: float
-@dataclass
+@dataclass(slots=True)
 class MergedChunk:
     chunk_ids: list
     document_id: str
@@ -26,26 +78,109 @@ class MergedChunk:
 class LocalTfIdfIndex:
     """Lightweight TF-IDF index for offline RAG."""
 
-    TOKEN_PATTERN = re.compile(r"[A-Za-z0-9']+")
+    # Applied to lowercased text; the {2,} bound bakes the minimum token
+    # length into the pattern so no separate filter pass is needed.
+    TOKEN_PATTERN = re.compile(r"[a-z0-9']{2,}")
 
     def __init__(self, chunks):
         self.chunks = list(chunks)
-        self._tokenised = [self._tokenise(c.text) for c in self.chunks]
+        self._tokenised = self._tokenise_corpus([c.text for c in self.chunks])
         self._doc_freq = Counter()
         for tokens in self._tokenised:
             unique_tokens = set(tokens)
             self._doc_freq.update(unique_tokens)
 
-        self._idf = {}
+        # Adding 1 inside the logarithm acts as smoothing and avoids division by zero.
         doc_count = len(self.chunks)
-        for token, df in self._doc_freq.items():
-            # Adding 1 inside the logarithm acts as smoothing and avoids division by zero.
-            self._idf[token] = math.log((1 + doc_count) / (1 + df)) + 1.0
+        if HAS_SCIPY and self._doc_freq:
+            # One vectorised log over the whole vocabulary.
+            df_values = np.fromiter(
+                self._doc_freq.values(), dtype=np.float64, count=len(self._doc_freq)
+            )
+            idf_values = np.log((1 + doc_count) / (1 + df_values)) + 1.0
+            self._idf = dict(zip(self._doc_freq, idf_values.tolist()))
+        else:
+            self._idf = {
+                token: math.log((1 + doc_count) / (1 + df)) + 1.0
+                for token, df in self._doc_freq.items()
+            }
+
+        # Column index per token, used by the sparse matrix backend.
+        self._vocab = {token: column for column, token in enumerate(self._idf)}
+
+        if HAS_SCIPY:
+            self._build_sparse_vectors()
+            self._vectors = None
+            self._norms = None
+            self._postings = None
+        else:
+            self._build_dict_vectors()
+            self._matrix = None
+
+        self._init_query_cache()
+
+    def _init_query_cache(self):
+        # Repeated queries (retries, the behaviour/suspensions pair sharing a
+        # prompt) skip re-tokenising and re-weighting the query.
+        self._cached_query_vector = functools.lru_cache(maxsize=256)(
+            self._build_query_vector
+        )
+
+    @classmethod
+    def load_or_build(cls, chunks, digest, cache_path):
+        """Restore a pickled index if the cache matches, otherwise build and save.
 
+        The cache is keyed on a digest of the source corpus plus the backend
+        in use, so edits to the JSONL (or installing SciPy) trigger a rebuild.
+        """
+        state = None
+        if cache_path.exists():
+            try:
+                with cache_path.open("rb") as handle:
+                    state = pickle.load(handle)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                state = None
+        if (
+            isinstance(state, dict)
+            and state.get("version") == INDEX_CACHE_VERSION
+            and state.get("digest") == digest
+            and state.get("has_scipy") == HAS_SCIPY
+        ):
+            index = cls.__new__(cls)
+            index.chunks = list(chunks)
+            index._tokenised = None
+            for attribute in _INDEX_CACHE_ATTRIBUTES:
+                setattr(index, attribute, state["attributes"][attribute])
+            index._init_query_cache()
+            return index
+
+        index = cls(chunks)
+        payload = {
+            "version": INDEX_CACHE_VERSION,
+            "digest": digest,
+            "has_scipy": HAS_SCIPY,
+            "attributes": {
+                attribute: getattr(index, attribute)
+                for attribute in _INDEX_CACHE_ATTRIBUTES
+            },
+        }
+        try:
+            with cache_path.open("wb") as handle:
+                pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            # The cache is best-effort; a read-only deployment still works.
+            pass
+        return index
+
+    def _build_dict_vectors(self):
+        self._norm_array = None
         self._vectors = []
         self._norms = []
-        for tokens in self._tokenised:
-            tf = Counter(tokens)
+        # token -> [(chunk index, weight), ...] so search only touches chunks
+        # that actually contain a query term.
+        self._postings = {}
+        for chunk_index, tokens in enumerate(self._tokenised):
+            tf = _count_tokens(tokens)
             vector = {}
             for token, count in tf.items():
                 if token not in self._idf:
@@ -53,67 +188,231 @@ class LocalTfIdfIndex:
                 tf_weight = 1.0 + math.log(count)
                 vector[token] = tf_weight * self._idf[token]
             norm = math.sqrt(sum(value * value for value in vector.values()))
+            if norm > 0.0:
+                # Stored weights are pre-divided by the chunk norm, so the
+                # per-query score is a plain dot product over the query terms.
+                vector = {token: weight / norm for token, weight in vector.items()}
+            for token, weight in vector.items():
+                self._postings.setdefault(token, []).append((chunk_index, weight))
             self._vectors.append(vector)
             self._norms.append(norm)
 
+    def _build_sparse_vectors(self):
+        """Pack the TF-IDF vectors into one CSR matrix (rows=chunks, cols=vocab)."""
+        data = []
+        indices = []
+        indptr = [0]
+        norms = []
+        for tokens in self._tokenised:
+            tf = _count_tokens(tokens)
+            chunk_tokens = [token for token in tf if token in self._idf]
+            if chunk_tokens:
+                # One vectorised log/multiply per chunk instead of a Python
+                # math.log call per (chunk, token) pair.
+                counts = np.fromiter(
+                    (tf[token] for token in chunk_tokens),
+                    dtype=np.float64,
+                    count=len(chunk_tokens),
+                )
+                idfs = np.fromiter(
+                    (self._idf[token] for token in chunk_tokens),
+                    dtype=np.float64,
+                    count=len(chunk_tokens),
+                )
+                weights = (1.0 + np.log(counts)) * idfs
+                norm = float(np.sqrt(np.dot(weights, weights)))
+                # Rows are stored pre-divided by their norm so scoring skips
+                # the per-chunk division.
+                data.extend((weights / norm).tolist())
+                indices.extend(self._vocab[token] for token in chunk_tokens)
+                norms.append(norm)
+            else:
+                norms.append(0.0)
+            indptr.append(len(data))
+        self._matrix = sparse.csr_matrix(
+            (data, indices, indptr),
+            shape=(len(self.chunks), len(self._vocab)),
+        )
+        self._norm_array = np.asarray(norms)
+
     def _tokenise(self, text):
-        tokens = [token.lower() for token in self.TOKEN_PATTERN.findall(text)]
-        return [token for token in tokens if len(token) > 1]
+        # One .lower() over the whole text instead of one per token, and a
+        # single findall in C with the length filter inside the pattern.
+        # Interning makes every repeated token one shared object, so the dict
+        # lookups during vector construction and search hit the pointer-equal
+        # fast path instead of comparing characters.
+        return [sys.intern(token) for token in self.TOKEN_PATTERN.findall(text.lower())]
+
+    def _tokenise_corpus(self, texts):
+        """Tokenise every chunk with one regex pass over a sentinel-joined blob.
+
+        Entering the regex engine once for the whole corpus beats one
+        findall per chunk; \\x01 cannot appear inside a token, so it hard
+        stops runs at chunk boundaries and matches map back to their source
+        chunk by position.
+        """
+        if not texts:
+            return []
+        lowered = [text.lower() for text in texts]
+        blob = "\x01".join(lowered)
+
+        # boundaries[i] is the blob offset where chunk i+1 starts.
+        boundaries = []
+        position = 0
+        for text in lowered:
+            position += len(text) + 1
+            boundaries.append(position)
+
+        tokenised = [[] for _ in lowered]
+        chunk_index = 0
+        for match in self.TOKEN_PATTERN.finditer(blob):
+            start = match.start()
+            while start >= boundaries[chunk_index]:
+                chunk_index += 1
+            tokenised[chunk_index].append(sys.intern(match.group()))
+        return tokenised
 
     def _build_query_vector(self, query):
-        tokens = self._tokenise(query)
-        tf = Counter(tokens)
-        vector = {}
-        for token, count in tf.items():
-            if token not in self._idf:
-                continue
-            tf_weight = 1.0 + math.log(count)
-            vector[token] = tf_weight * self._idf[token]
+        # Count only in-vocabulary tokens, so fully out-of-vocabulary queries
+        # bail out before any weights are computed.
+        idf = self._idf
+        tf = {}
+        for token in _tokenise_query(query):
+            if token in idf:
+                tf[token] = tf.get(token, 0) + 1
+        if not tf:
+            return {}, 0.0
+        vector = {
+            token: (1.0 + math.log(count)) * idf[token] for token, count in tf.items()
+        }
         norm = math.sqrt(sum(value * value for value in vector.values()))
         return vector, norm
 
     def search(self, query, top_k = 5, min_score = 0.0):
         if not query.strip():
             return []
-        query_vector, query_norm = self._build_query_vector(query)
+        query_vector, query_norm = self._cached_query_vector(query)
         if not query_vector or query_norm == 0.0:
             return []
 
+        if self._matrix is not None:
+            return self._search_sparse(query_vector, query_norm, top_k, min_score)
+
+        # Accumulate dot products over the query terms' posting lists — work
+        # proportional to the matching chunks, not the whole corpus.
+        dots = {}
+        for token, query_weight in query_vector.items():
+            for chunk_index, chunk_weight in self._postings.get(token, ()):
+                dots[chunk_index] = dots.get(chunk_index, 0.0) + query_weight * chunk_weight
+
         results = []
-        for _, (chunk, chunk_vector, chunk_norm) in enumerate(zip(self.chunks, self._vectors, self._norms)):
-            if chunk_norm == 0.0:
-                continue
-            dot = 0.0
-            for token, weight in query_vector.items():
-                dot += weight * chunk_vector.get(token, 0.0)
+        for chunk_index in sorted(dots):
+            dot = dots[chunk_index]
             if dot <= 0.0:
                 continue
-            score = dot / (chunk_norm * query_norm)
+            score = dot / query_norm
             if score >= min_score:
-                results.append(ScoredChunk(chunk=chunk, score=score))
+                results.append(ScoredChunk(chunk=self.chunks[chunk_index], score=score))
 
         results.sort(key=lambda item: item.score, reverse=True)
         return results[:top_k]
 
+    def _search_sparse(self, query_vector, query_norm, top_k, min_score):
+        """Score every chunk with a single sparse matrix-vector product."""
+        query_array = np.zeros(len(self._vocab))
+        for token, weight in query_vector.items():
+            query_array[self._vocab[token]] = weight
+
+        dots = self._matrix @ query_array
+        scores = np.zeros(len(self.chunks))
+        valid = dots > 0.0
+        scores[valid] = dots[valid] / query_norm
+
+        # Partial selection: O(N + k log k) instead of sorting every score.
+        # Sorting the survivors by index first keeps the final stable sort's
+        # tie-break identical to the old full sort.
+        if top_k < len(scores):
+            candidate_indices = np.argpartition(-scores, top_k)[:top_k]
+        else:
+            candidate_indices = np.arange(len(scores))
+        candidate_indices = np.sort(candidate_indices)
+        order = np.argsort(-scores[candidate_indices], kind="stable")
 
-def load_chunks(jsonl_path):
+        results = []
+        for index in candidate_indices[order]:
+            score = float(scores[index])
+            if score <= 0.0 or score < min_score:
+                continue
+            results.append(ScoredChunk(chunk=self.chunks[index], score=score))
+        return results
+
+
+def _chunks_from_bytes(payload):
     chunks = []
-    with jsonl_path.open("r", encoding="utf-8") as handle:
-        for order, line in enumerate(handle):
-            data = json.loads(line)
-            chunks.append(
-                Chunk(
-                    id=data["id"],
-                    document_id=data["document_id"],
-                    text=data["text"],
-                    metadata=data.get("metadata", {}),
-                    order=order,
-                )
+    for order, line in enumerate(payload.splitlines()):
+        data = _loads(line)
+        chunks.append(
+            Chunk(
+                id=data["id"],
+                document_id=data["document_id"],
+                text=data["text"],
+                metadata=data.get("metadata", {}),
+                order=order,
             )
+        )
     return chunks
 
 
-def merge_chunks_by_index(chunks, indices):
+def load_chunks(jsonl_path):
+    # Read as bytes; orjson decodes UTF-8 itself and is much faster than
+    # stdlib json on these corpora.
+    return _chunks_from_bytes(jsonl_path.read_bytes())
+
+
+@dataclass
+class ChunkMetadataArrays:
+    """Per-chunk metadata coerced once, so merges skip the dict/int parsing."""
+    page_starts: list
+    page_ends: list
+    paragraph_numbers: list
+    hierarchies: list
+
+
+def build_chunk_metadata(chunks):
+    """Extract the merge-relevant metadata fields into parallel lists."""
+    page_starts = []
+    page_ends = []
+    paragraph_numbers = []
+    hierarchies = []
+    for chunk in chunks:
+        metadata = chunk.metadata
+        page_start = metadata.get("page_start")
+        page_starts.append(int(page_start) if page_start is not None else None)
+        page_end = metadata.get("page_end")
+        page_ends.append(int(page_end) if page_end is not None else None)
+        paragraph_number = metadata.get("paragraph_number")
+        try:
+            paragraph_numbers.append(
+                int(paragraph_number) if paragraph_number is not None else None
+            )
+        except (ValueError, TypeError):
+            paragraph_numbers.append(None)
+        hierarchy = metadata.get("heading_hierarchy")
+        if isinstance(hierarchy, list):
+            hierarchies.append(tuple(hierarchy))
+        elif isinstance(hierarchy, str):
+            hierarchies.append((hierarchy,))
+        else:
+            hierarchies.append(None)
+    return ChunkMetadataArrays(
+        page_starts=page_starts,
+        page_ends=page_ends,
+        paragraph_numbers=paragraph_numbers,
+        hierarchies=hierarchies,
+    )
+
+
+def merge_chunks_by_index(chunks, indices, metadata_arrays=None):
     sorted_indices = sorted(indices)
     combined_text_parts = []
     merged_metadata = {}
@@ -127,28 +426,42 @@ def merge_chunks_by_index(chunks, indices):
     paragraph_numbers = []
     heading_hierarchy = None
 
-    for index in sorted_indices:
-        chunk = chunks[index]
-        chunk_ids.append(chunk.id)
-        combined_text_parts.append(chunk.text)
-        metadata = chunk.metadata
-
-        if heading_hierarchy is None:
-            hierarchy = metadata.get("heading_hierarchy")
-            if isinstance(hierarchy, list):
-                heading_hierarchy = tuple(hierarchy)
-            elif isinstance(hierarchy, str):
-                heading_hierarchy = (hierarchy,)
-
-        if "page_start" in metadata and metadata["page_start"] is not None:
-            page_starts.append(int(metadata["page_start"]))
-        if "page_end" in metadata and metadata["page_end"] is not None:
-            page_ends.append(int(metadata["page_end"]))
-        if "paragraph_number" in metadata and metadata["paragraph_number"] is not None:
-            try:
-                paragraph_numbers.append(int(metadata["paragraph_number"]))
-            except (ValueError, TypeError):
-                pass
+    if metadata_arrays is not None:
+        for index in sorted_indices:
+            chunk = chunks[index]
+            chunk_ids.append(chunk.id)
+            combined_text_parts.append(chunk.text)
+            if heading_hierarchy is None:
+                heading_hierarchy = metadata_arrays.hierarchies[index]
+            if metadata_arrays.page_starts[index] is not None:
+                page_starts.append(metadata_arrays.page_starts[index])
+            if metadata_arrays.page_ends[index] is not None:
+                page_ends.append(metadata_arrays.page_ends[index])
+            if metadata_arrays.paragraph_numbers[index] is not None:
+                paragraph_numbers.append(metadata_arrays.paragraph_numbers[index])
+    else:
+        for index in sorted_indices:
+            chunk = chunks[index]
+            chunk_ids.append(chunk.id)
+            combined_text_parts.append(chunk.text)
+            metadata = chunk.metadata
+
+            if heading_hierarchy is None:
+                hierarchy = metadata.get("heading_hierarchy")
+                if isinstance(hierarchy, list):
+                    heading_hierarchy = tuple(hierarchy)
+                elif isinstance(hierarchy, str):
+                    heading_hierarchy = (hierarchy,)
+
+            if "page_start" in metadata and metadata["page_start"] is not None:
+                page_starts.append(int(metadata["page_start"]))
+            if "page_end" in metadata and metadata["page_end"] is not None:
+                page_ends.append(int(metadata["page_end"]))
+            if "paragraph_number" in metadata and metadata["paragraph_number"] is not None:
+                try:
+                    paragraph_numbers.append(int(metadata["paragraph_number"]))
+                except (ValueError, TypeError):
+                    pass
 
     if page_starts:
         merged_metadata["page_start"] = min(page_starts)
@@ -171,22 +484,28 @@ def merge_chunks_by_index(chunks, indices):
     )
 
 
-def contiguous_groups(indices):
-    sorted_indices = sorted(set(indices))
+def contiguous_groups_from_sorted(sorted_indices):
+    """Group consecutive runs of indices that are already sorted and unique."""
     if not sorted_indices:
         return []
     groups = []
     current_group = [sorted_indices[0]]
+    previous = sorted_indices[0]
     for idx in sorted_indices[1:]:
-        if idx == current_group[-1] + 1:
+        if idx == previous + 1:
             current_group.append(idx)
         else:
             groups.append(current_group)
             current_group = [idx]
+        previous = idx
     groups.append(current_group)
     return groups
 
 
+def contiguous_groups(indices):
+    return contiguous_groups_from_sorted(sorted(set(indices)))
+
+
 def format_page_range(metadata):
     start = metadata.get("page_start")
     end = metadata.get("page_end")
@@ -217,19 +536,69 @@ class GuidanceRetriever:
         if base_dir is None:
             base_dir = Path("data") / "guidance_chunks"
 
-        behaviour_path = base_dir / "behaviour_in_schools.jsonl"
-        suspensions_path = base_dir / "suspensions.jsonl"
+        self._behaviour_path = base_dir / "behaviour_in_schools.jsonl"
+        self._suspensions_path = base_dir / "suspensions.jsonl"
 
-        if not behaviour_path.exists():
-            raise FileNotFoundError(f"Behaviour guidance corpus not found at {behaviour_path}")
-        if not suspensions_path.exists():
-            raise FileNotFoundError(f"Suspensions guidance corpus not found at {suspensions_path}")
+        if not self._behaviour_path.exists():
+            raise FileNotFoundError(f"Behaviour guidance corpus not found at {self._behaviour_path}")
+        if not self._suspensions_path.exists():
+            raise FileNotFoundError(f"Suspensions guidance corpus not found at {self._suspensions_path}")
 
-        self.behaviour_chunks = load_chunks(behaviour_path)
-        self.suspensions_chunks = load_chunks(suspensions_path)
+        # Retries and re-sent prompts repeat the exact same query; the cache
+        # skips the full TF-IDF scan on those. Callers must treat the
+        # returned blocks as read-only.
+        self._cached_context_blocks = functools.lru_cache(maxsize=256)(
+            self._build_context_blocks_uncached
+        )
 
-        self.behaviour_index = LocalTfIdfIndex(self.behaviour_chunks)
-        self.suspensions_index = LocalTfIdfIndex(self.suspensions_chunks)
+    # Corpus loading and index construction are deferred to first use, so a
+    # session that only ever searches one corpus never pays for the other.
+
+    @functools.cached_property
+    def _behaviour_corpus(self):
+        payload = self._behaviour_path.read_bytes()
+        return _chunks_from_bytes(payload), hashlib.sha256(payload).hexdigest()
+
+    @functools.cached_property
+    def _suspensions_corpus(self):
+        payload = self._suspensions_path.read_bytes()
+        return _chunks_from_bytes(payload), hashlib.sha256(payload).hexdigest()
+
+    @functools.cached_property
+    def behaviour_chunks(self):
+        return self._behaviour_corpus[0]
+
+    @functools.cached_property
+    def suspensions_chunks(self):
+        return self._suspensions_corpus[0]
+
+    @functools.cached_property
+    def behaviour_index(self):
+        # Restore the prebuilt index from disk on warm starts; the cache key
+        # tracks the corpus bytes so regenerated chunks rebuild cleanly.
+        chunks, digest = self._behaviour_corpus
+        return LocalTfIdfIndex.load_or_build(
+            chunks,
+            digest=digest,
+            cache_path=self._behaviour_path.with_suffix(".index.pkl"),
+        )
+
+    @functools.cached_property
+    def suspensions_index(self):
+        chunks, digest = self._suspensions_corpus
+        return LocalTfIdfIndex.load_or_build(
+            chunks,
+            digest=digest,
+            cache_path=self._suspensions_path.with_suffix(".index.pkl"),
+        )
+
+    @functools.cached_property
+    def _behaviour_metadata(self):
+        return build_chunk_metadata(self.behaviour_chunks)
+
+    @functools.cached_property
+    def _suspensions_metadata(self):
+        return build_chunk_metadata(self.suspensions_chunks)
 
     @staticmethod
     def _group_key_behaviour(chunk):
@@ -245,17 +614,22 @@ class GuidanceRetriever:
             hierarchy = [hierarchy]
         return tuple(filter(None, hierarchy))
 
-    def _expand_grouped_results(self, results, index, grouping_fn, neighbours, limit):
+    def _expand_grouped_results(self, results, index, grouping_fn, neighbours, limit, metadata_arrays=None):
         if not results:
             return []
 
-        grouped_indices = {}
-        score_by_index = {}
+        # group_key -> {chunk index: best adjusted score}; one structure feeds
+        # both membership and the merged-score computation below.
+        grouped_scores = {}
+
+        # decay[offset + neighbours] == 0.9 ** |offset|; scores are
+        # non-negative cosines, so no clamping to zero is needed.
+        decay = [0.9 ** abs(offset) for offset in range(-neighbours, neighbours + 1)]
 
         for scored in results:
             base_index = scored.chunk.order
             group_key = grouping_fn(scored.chunk)
-            bucket = grouped_indices.setdefault(group_key, set())
+            bucket = grouped_scores.setdefault(group_key, {})
 
             for offset in range(-neighbours, neighbours + 1):
                 candidate_index = base_index + offset
@@ -264,15 +638,18 @@ class GuidanceRetriever:
                 neighbour_chunk = index.chunks[candidate_index]
                 if grouping_fn(neighbour_chunk) != group_key:
                     continue
-                bucket.add(candidate_index)
-                adjusted_score = scored.score if offset == 0 else max(scored.score * 0.9, 0.0)
-                score_by_index[candidate_index] = max(score_by_index.get(candidate_index, 0.0), adjusted_score)
+                adjusted_score = scored.score * decay[offset + neighbours]
+                existing_score = bucket.get(candidate_index)
+                if existing_score is None or adjusted_score > existing_score:
+                    bucket[candidate_index] = adjusted_score
 
         merged_results = []
-        for group_key, indices in grouped_indices.items():
-            for contiguous in contiguous_groups(indices):
-                merged = merge_chunks_by_index(index.chunks, contiguous)
-                merged.score = max(score_by_index.get(i, 0.0) for i in contiguous)
+        for group_key, bucket in grouped_scores.items():
+            # The bucket keys are unique, so one sort is enough; skip the
+            # redundant de-duplication inside contiguous_groups.
+            for contiguous in contiguous_groups_from_sorted(sorted(bucket)):
+                merged = merge_chunks_by_index(index.chunks, contiguous, metadata_arrays)
+                merged.score = max(bucket[i] for i in contiguous)
                 merged.metadata["group_key"] = group_key
                 merged_results.append(merged)
 
@@ -287,6 +664,7 @@ class GuidanceRetriever:
             grouping_fn=self._group_key_behaviour,
             neighbours=neighbours,
             limit=top_k,
+            metadata_arrays=self._behaviour_metadata,
         )
 
     def search_suspensions(self, query, top_k = 8, neighbours = 1):
@@ -297,9 +675,10 @@ class GuidanceRetriever:
             grouping_fn=self._group_key_suspensions,
             neighbours=neighbours,
             limit=top_k,
+            metadata_arrays=self._suspensions_metadata,
         )
 
-    def build_context_blocks(self, query, behaviour_top_k = 3, suspensions_top_k = 8):
+    def _build_context_blocks_uncached(self, query, behaviour_top_k, suspensions_top_k):
         behaviour_blocks = self.search_behaviour(query, top_k=behaviour_top_k)
         suspensions_blocks = self.search_suspensions(query, top_k=suspensions_top_k)
         return {
@@ -307,6 +686,9 @@ class GuidanceRetriever:
             "suspensions": suspensions_blocks,
         }
 
+    def build_context_blocks(self, query, behaviour_top_k = 3, suspensions_top_k = 8):
+        return self._cached_context_blocks(query, behaviour_top_k, suspensions_top_k)
+
 
 def format_behaviour_block(block):
     hierarchy = block.metadata.get("group_key") or block.metadata.get("heading_hierarchy") or []
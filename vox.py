@@ -1,4 +1,5 @@
 # app.py
+import functools
 import json
 import os
 import uuid
@@ -15,15 +16,20 @@ except ImportError as exc:  # pragma: no cover
         "Install it with `pip install streamlit`."
     ) from exc
 from datetime import date, datetime, timezone
-import pytz
+from zoneinfo import ZoneInfo
+
+UK_TZ = ZoneInfo("Europe/London")
+
+from requests.adapters import HTTPAdapter
 
 try:
-    from google.auth.transport.requests import AuthorizedSession
-    from google.oauth2 import service_account
+    import orjson
 
-    HAS_GOOGLE_AUTH = True
+    def _json_dumps(obj):
+        return orjson.dumps(obj)
 except ImportError:  # pragma: no cover
-    HAS_GOOGLE_AUTH = False
+    def _json_dumps(obj):
+        return json.dumps(obj).encode("utf-8")
 
 from position_statement_renderer import (
     extract_json_from_response,
@@ -70,6 +76,7 @@ def _get_root_secret(key):
         return None
 
 
+@functools.lru_cache(maxsize=1)
 def _load_service_account_info():
     info = _get_secret_table("google_service_account")
     if info:
@@ -95,87 +102,157 @@ def _load_service_account_info():
     )
 
 
-def _get_spreadsheet_id():
-    # Check if it's nested in google_service_account section
-    service_account_info = _get_secret_table("google_service_account")
-    if service_account_info and "google_sheets_spreadsheet_id" in service_account_info:
-        return service_account_info["google_sheets_spreadsheet_id"]
-    
-    # Check if it's at root level
-    root_value = _get_root_secret("google_sheets_spreadsheet_id")
-    if root_value:
-        return root_value
-    
-    sheet_id = os.getenv("GOOGLE_SHEETS_SPREADSHEET_ID", "")
-    if sheet_id:
-        return sheet_id
-    raise RuntimeError(
-        "Google Sheets spreadsheet ID is missing. "
-        "Set st.secrets['google_service_account']['google_sheets_spreadsheet_id'], "
-        "st.secrets['google_sheets_spreadsheet_id'], or the GOOGLE_SHEETS_SPREADSHEET_ID environment variable."
+@functools.lru_cache(maxsize=1)
+def _sheets_config():
+    """Resolve the spreadsheet id and range once per process.
+
+    Each probe of st.secrets dict-walks the parsed secrets.toml, so the
+    nested/root/env fallback chains are evaluated a single time here
+    instead of per submission.
+    """
+    service_account_info = _get_secret_table("google_service_account") or {}
+
+    spreadsheet_id = (
+        service_account_info.get("google_sheets_spreadsheet_id")
+        or _get_root_secret("google_sheets_spreadsheet_id")
+        or os.getenv("GOOGLE_SHEETS_SPREADSHEET_ID", "")
     )
+    if not spreadsheet_id:
+        raise RuntimeError(
+            "Google Sheets spreadsheet ID is missing. "
+            "Set st.secrets['google_service_account']['google_sheets_spreadsheet_id'], "
+            "st.secrets['google_sheets_spreadsheet_id'], or the GOOGLE_SHEETS_SPREADSHEET_ID environment variable."
+        )
 
+    range_name = (
+        service_account_info.get("google_sheets_range")
+        or _get_root_secret("google_sheets_range")
+        or os.getenv("GOOGLE_SHEETS_RANGE", "Feedback!A:P")
+    )
+    return spreadsheet_id, range_name
 
-def _get_spreadsheet_range():
-    # Check if it's nested in google_service_account section
-    service_account_info = _get_secret_table("google_service_account")
-    if service_account_info and "google_sheets_range" in service_account_info:
-        return service_account_info["google_sheets_range"]
-    
-    # Check if it's at root level
-    root_value = _get_root_secret("google_sheets_range")
-    if root_value:
-        return root_value
-    
-    return os.getenv("GOOGLE_SHEETS_RANGE", "Feedback!A:P")
 
+@st.cache_resource
+def _get_authed_session():
+    """One session per process: credentials parsing, the OAuth token exchange,
+    and the pooled TLS connection are all reused across reruns.
 
-def append_feedback_to_sheet(feedback):
-    if not HAS_GOOGLE_AUTH:
+    google-auth is imported lazily so sessions that never submit feedback
+    do not pay its import cost on app start."""
+    try:
+        from google.auth.transport.requests import AuthorizedSession
+        from google.oauth2 import service_account
+    except ImportError as exc:  # pragma: no cover
         raise ImportError(
             "google-auth is required to talk to the Google Sheets API. "
             "Install it with `pip install google-auth`."
-        )
-
-    service_info = _load_service_account_info()
+        ) from exc
     credentials = service_account.Credentials.from_service_account_info(
-        service_info,
+        _load_service_account_info(),
         scopes=SHEETS_SCOPES,
     )
-    authed_session = AuthorizedSession(credentials)
-    spreadsheet_id = _get_spreadsheet_id()
-    range_name = _get_spreadsheet_range()
-
-    values = [[
-        feedback["run_id"],
-        feedback["timestamp_utc"],
-        feedback.get("reviewer_name", ""),
-        feedback.get("reviewer_email", ""),
-        feedback["stage"],
-        feedback["accuracy"],
-        feedback["relevance"],
-        feedback["writing_style"],
-        feedback["presentation"],
-        feedback["ease_of_use"],
-        feedback["remarks"],
-        feedback.get("pdf_filename", ""),
-        feedback.get("school_facts_llm", ""),
-        feedback.get("exclusion_reason_llm", ""),
-        feedback.get("student_perspective_llm", ""),
-        feedback.get("position_statement_json_llm", ""),
-    ]]
+    session = AuthorizedSession(credentials)
+    # Keep-alive pooling sized for this app's single endpoint, with retries
+    # for transient Sheets API failures.
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=3))
+    return session
+
+
+# Sheet column order (Feedback!A:P); rows are built from this tuple so the
+# payload keys and the sheet layout cannot drift apart silently.
+_SHEET_FIELDS = (
+    "run_id",
+    "timestamp_utc",
+    "reviewer_name",
+    "reviewer_email",
+    "stage",
+    "accuracy",
+    "relevance",
+    "writing_style",
+    "presentation",
+    "ease_of_use",
+    "remarks",
+    "pdf_filename",
+    "school_facts_llm",
+    "exclusion_reason_llm",
+    "student_perspective_llm",
+    "position_statement_json_llm",
+)
 
+
+def append_feedback_to_sheet(feedback):
+    row = [feedback.get(field, "") for field in _SHEET_FIELDS]
+
+    # Queue then flush: if a previous flush failed, its rows are still
+    # pending and go out with this one in a single append call.
+    pending = st.session_state.setdefault("pending_feedback_rows", [])
+    pending.append(row)
+    flush_feedback_queue()
+
+
+def flush_feedback_queue():
+    """Send every queued feedback row to the Sheets API in one request."""
+    pending = st.session_state.get("pending_feedback_rows") or []
+    if not pending:
+        return
+
+    authed_session = _get_authed_session()
+    spreadsheet_id, range_name = _sheets_config()
     url = (
         f"https://sheets.googleapis.com/v4/spreadsheets/{spreadsheet_id}/values/"
         f"{range_name}:append?valueInputOption=USER_ENTERED"
     )
-    
-    response = authed_session.post(url, json={"values": values})
-    
+
+    # Pre-serialise with orjson instead of going through requests' json= path.
+    response = authed_session.post(
+        url,
+        data=_json_dumps({"values": pending}),
+        headers={"Content-Type": "application/json"},
+    )
+
     if response.status_code >= 300:
         raise RuntimeError(
             f"Sheets API returned {response.status_code}: {response.text}"
         )
+    st.session_state["pending_feedback_rows"] = []
+
+# Cached fronts for the expensive pipeline steps: a rerun (double click,
+# widget interaction after submit) with identical inputs becomes a lookup
+# instead of repeated LLM calls.
+@st.cache_data(show_spinner=False, ttl=3600)
+def _cached_extract_all(*args):
+    return extract_all(*args)
+
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def _cached_generate_position_statement(**kwargs):
+    return generate_position_statement(**kwargs)
+
+
+@st.cache_data(show_spinner=False)
+def _cached_background_summary(answer_items):
+    return compute_background_summary(dict(answer_items))
+
+
+@st.cache_data(show_spinner=False)
+def _parse_position(raw):
+    """Memoise JSON extraction from an LLM response so retries of the submit
+    branch do not re-parse the same (possibly large) output."""
+    return extract_json_from_response(raw)
+
+
+@st.cache_resource
+def _load_grounds(stage):
+    """Grounds JSON for the stage, read from disk once per process."""
+    grounds_path = (
+        Path("documents/irp_arguments.json") if stage == "Independent Review Panel"
+        else Path("documents/governors_panel_arguments.json")
+    )
+    try:
+        return grounds_path.read_text(encoding="utf-8"), None
+    except FileNotFoundError:
+        return "{}", grounds_path
+
 
 st.set_page_config(page_title="Segmented Chatbot", page_icon="💬", layout="centered")
 
@@ -227,20 +304,61 @@ QUESTIONS = {
     ],
 }
 
+# Keys that never block segment completion.
+_OPTIONAL_KEYS = {"other_information_provided", "exclusion_letter_date"}
+
+# Per-segment (key, condition, type) tuples for the completeness check, so
+# segment_done iterates a prebuilt tuple instead of re-filtering QUESTIONS
+# and rebuilding the optional-key set on every call.
+REQUIRED_QUESTIONS = {
+    segment_id: tuple(
+        (q["key"], q.get("condition"), q["type"])
+        for q in segment_questions
+        if q["key"] not in _OPTIONAL_KEYS
+    )
+    for segment_id, segment_questions in QUESTIONS.items()
+}
+
+# Distinguishes "no stored answer" from a stored None in the main loop's
+# unchanged-value check.
+_SENTINEL = object()
+
+# Answer keys whose value can end the questionnaire early: callable takes the
+# current value and returns the error message to show, or None to continue.
+EARLY_STOP_CHECKS = {
+    "is_permanently_excluded": lambda v: (
+        "⚠️ We currently only support permanent exclusions, not suspensions."
+        if v == "No"
+        else None
+    ),
+}
+
 # ---------------------------
 # Helpers
 # ---------------------------
-def heading_bubble(text, color):
+@st.cache_resource
+def _inject_bubble_css():
+    """Inject the heading-bubble stylesheet once instead of per bubble."""
     st.markdown(
-        f"""
+        """
         <style>
-        .heading-bubble h4 {{
+        .heading-bubble h4 {
             color: #000000 !important;
-        }}
-        .heading-bubble {{
+        }
+        .heading-bubble {
             color: #000000 !important;
-        }}
+        }
         </style>
+        """,
+        unsafe_allow_html=True,
+    )
+    return True
+
+_inject_bubble_css()
+
+def heading_bubble(text, color):
+    st.markdown(
+        f"""
         <div class="heading-bubble" style="
             background:{color};
             padding: 14px 16px;
@@ -254,87 +372,119 @@ def heading_bubble(text, color):
         unsafe_allow_html=True,
     )
 
-def ask_question(q, answers):
-    """Render a single question and return possibly updated answer for this key."""
+def _render_text(q, answers):
+    key = q["key"]
+    return st.text_input(q["prompt"], key=key, value=answers.get(key, ""), help="")
+
+def _render_textarea(q, answers):
+    key = q["key"]
+    return st.text_area(q["prompt"], key=key, value=answers.get(key, ""), help="")
+
+def _render_number(q, answers):
+    key = q["key"]
+    return st.number_input(q["prompt"], key=key, value=answers.get(key, 0), step=1)
+
+def _render_select(q, answers):
+    key = q["key"]
+    options = q["options"]
+    return st.selectbox(
+        q["prompt"],
+        options,
+        key=key,
+        index=(options.index(answers[key]) if answers.get(key) in options else 0),
+    )
+
+def _render_radio(q, answers):
+    # Show radio with no default selection unless a previous answer exists
+    key = q["key"]
+    options = q["options"]
+    prev_value = answers.get(key)
+    widget_value = st.session_state.get(key)
+
+    if widget_value in options:
+        default_index = None  # let Streamlit use the widget state
+    elif prev_value in options:
+        default_index = options.index(prev_value)
+    else:
+        default_index = None
+
+    return st.radio(
+        q["prompt"],
+        options,
+        key=key,
+        horizontal=True,
+        index=default_index,
+    )
+
+def _render_checkbox(q, answers):
     key = q["key"]
-    prompt = q["prompt"]
-    qtype = q["type"]
-    options = q.get("options")
+    return st.checkbox(q["prompt"], key=key, value=bool(answers.get(key, False)))
+
+def _render_date(q, answers):
+    key = q["key"]
+    prev_value = answers.get(key)
+    if isinstance(prev_value, str):
+        try:
+            prev_value = datetime.fromisoformat(prev_value).date()
+        except ValueError:
+            prev_value = None
+    if isinstance(prev_value, datetime):
+        prev_value = prev_value.date()
+    return st.date_input(
+        q["prompt"],
+        key=key,
+        value=prev_value if isinstance(prev_value, date) else None,
+    )
 
+# One dict lookup per question per rerun instead of a string-comparison chain.
+_RENDERERS = {
+    "text": _render_text,
+    "textarea": _render_textarea,
+    "number": _render_number,
+    "select": _render_select,
+    "radio": _render_radio,
+    "checkbox": _render_checkbox,
+    "date": _render_date,
+}
+
+def ask_question(q, answers):
+    """Render a single question and return possibly updated answer for this key."""
     # Only render if no condition or condition passes
     cond = q.get("condition")
     if cond and not cond(answers):
-        return answers.get(key, None)  # skip but preserve previous value if any
-
-    # Render appropriate widget
-    if qtype == "text":
-        val = st.text_input(prompt, key=key, value=answers.get(key, ""), help="")
-    elif qtype == "textarea":
-        val = st.text_area(prompt, key=key, value=answers.get(key, ""), help="")
-    elif qtype == "number":
-        val = st.number_input(prompt, key=key, value=answers.get(key, 0), step=1)
-    elif qtype == "select":
-        val = st.selectbox(prompt, options, key=key, index=(options.index(answers[key]) if answers.get(key) in options else 0))
-    elif qtype == "radio":
-        # Show radio with no default selection unless a previous answer exists
-        prev_value = answers.get(key)
-        widget_value = st.session_state.get(key)
-
-        if widget_value in options:
-            default_index = None  # let Streamlit use the widget state
-        elif prev_value in options:
-            default_index = options.index(prev_value)
-        else:
-            default_index = None
-
-        val = st.radio(
-            prompt,
-            options,
-            key=key,
-            horizontal=True,
-            index=default_index,
-        )
-    elif qtype == "checkbox":
-        val = st.checkbox(prompt, key=key, value=bool(answers.get(key, False)))
-    elif qtype == "date":
-        prev_value = answers.get(key)
-        if isinstance(prev_value, str):
-            try:
-                prev_value = datetime.fromisoformat(prev_value).date()
-            except ValueError:
-                prev_value = None
-        if isinstance(prev_value, datetime):
-            prev_value = prev_value.date()
-        val = st.date_input(
-            prompt,
-            key=key,
-            value=prev_value if isinstance(prev_value, date) else None,
-        )
-    else:
-        st.warning(f"Unknown question type: {qtype}")
-        val = answers.get(key)
+        return answers.get(q["key"], None)  # skip but preserve previous value if any
 
-    return val
+    renderer = _RENDERERS.get(q["type"])
+    if renderer is None:
+        st.warning(f"Unknown question type: {q['type']}")
+        return answers.get(q["key"])
+    return renderer(q, answers)
 
 def segment_done(segment_id, answers):
     """Check if all visible questions in a segment have been answered (non-empty)."""
-    for q in QUESTIONS[segment_id]:
-        if q["key"] in {"other_information_provided", "exclusion_letter_date"}:
-            continue
-        cond = q.get("condition")
+    for key, cond, qtype in REQUIRED_QUESTIONS[segment_id]:
         if cond and not cond(answers):
             continue
-        v = answers.get(q["key"])
+        v = answers.get(key)
         if v in (None, ""):
             # For checkbox False is a valid answer; treat None only as missing
-            if q["type"] == "checkbox":
-                if answers.get(q["key"]) is None:
+            if qtype == "checkbox":
+                if v is None:
                     return False
             else:
                 return False
     return True
 
 
+def _fmt_uk_date(value):
+    """Format a date/datetime (or pass through a string) as e.g. 12 March 2025."""
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return value.strftime("%d %B %Y")
+    return value if isinstance(value, str) else ""
+
+
 SENSITIVE_ANSWER_KEYS = {
     "child_name",
     "parent_name",
@@ -436,7 +586,9 @@ def _finalize_position_statement(workflow_state):
         "exclusion_letter_date": user_details.get("exclusion_letter_date", ""),
         "pdf_filename": download_name,
     }
-    st.session_state["latest_pdf_bytes"] = pdf_bytes
+    # Store the path, not the bytes: the blob would otherwise sit in RAM for
+    # the session's lifetime, duplicated per session.
+    st.session_state["latest_pdf_path"] = str(rendered_statement.pdf_path)
     st.session_state["latest_pdf_name"] = download_name
     st.session_state["latest_json_payload"] = position_payload
     st.session_state["latest_raw_response"] = position_statement_raw
@@ -448,8 +600,65 @@ def _finalize_position_statement(workflow_state):
 
     workflow_state["finalized"] = True
     st.session_state["position_workflow"] = workflow_state
+    st.session_state["run_complete"] = True
     st.session_state.pop("clarification_state", None)
 
+@st.fragment
+def _render_evaluation_form():
+    """Reviewer evaluation form, scoped so slider/text interactions rerun
+    only this fragment rather than the whole script."""
+    st.subheader("Reviewer Evaluation")
+    with st.form("evaluation_form"):
+        run_id = st.session_state["latest_run"]["run_id"]
+        st.markdown(f"Run ID: `{run_id}`")
+
+        # Reviewer information
+        st.markdown("**Reviewer Information**")
+        reviewer_name = st.text_input("Your name", placeholder="Enter your full name")
+        reviewer_email = st.text_input("Your email", placeholder="Enter your email address")
+
+        st.markdown("**Evaluation Scores**")
+        accuracy_score = st.slider("Accuracy of factual content", 0, 10, 5)
+        relevance_score = st.slider("Relevance of arguments", 0, 10, 5)
+        writing_score = st.slider("Writing style and clarity", 0, 10, 5)
+        presentation_score = st.slider("Presentation of document", 0, 10, 5)
+        ease_score = st.slider("Ease of using this tool", 0, 10, 5)
+        reviewer_remarks = st.text_area("Additional comments or specific issues", height=120)
+        submitted_feedback = st.form_submit_button("Submit feedback")
+
+    if submitted_feedback:
+        # Use UK timezone instead of UTC
+        timestamp_uk = datetime.now(UK_TZ).isoformat()
+        summaries = st.session_state.get("extracted_summaries") or {}
+        position_payload_state = st.session_state.get("latest_json_payload")
+        feedback_payload = {
+            "run_id": run_id,
+            "timestamp_utc": timestamp_uk,  # Note: keeping field name as timestamp_utc for compatibility
+            "reviewer_name": reviewer_name,
+            "reviewer_email": reviewer_email,
+            "stage": st.session_state["latest_run"]["stage"],
+            "accuracy": accuracy_score,
+            "relevance": relevance_score,
+            "writing_style": writing_score,
+            "presentation": presentation_score,
+            "ease_of_use": ease_score,
+            "remarks": reviewer_remarks,
+            "pdf_filename": st.session_state["latest_run"]["pdf_filename"],
+            "school_facts_llm": summaries.get("school_facts", ""),
+            "exclusion_reason_llm": summaries.get("exclusion_reason", ""),
+            "student_perspective_llm": summaries.get("student_perspective", ""),
+            "position_statement_json_llm": json.dumps(position_payload_state) if position_payload_state else "",
+        }
+        st.write("Feedback payload:", feedback_payload)
+
+        try:
+            append_feedback_to_sheet(feedback_payload)
+        except Exception as exc:  # pragma: no cover - runtime feedback
+            st.error(f"Could not record feedback: {exc}")
+        else:
+            st.success("Feedback recorded successfully.")
+            st.balloons()
+
 # ---------------------------
 # State
 # ---------------------------
@@ -472,11 +681,17 @@ heading_bubble(f"<h4 style='margin:0'>{current['title']}</h4>", current["color"]
 for q in QUESTIONS[current["id"]]:
     # Evaluate and render question (handles conditionals)
     val = ask_question(q, answers)
-    answers[q["key"]] = val
-
-    if q["key"] == "is_permanently_excluded" and val == "No":
-        st.error("⚠️ We currently only support permanent exclusions, not suspensions.")
-        st.stop()
+    # Skip the session_state write when the answer is unchanged so Streamlit's
+    # change detection does not churn on every rerun.
+    if val != answers.get(q["key"], _SENTINEL):
+        answers[q["key"]] = val
+
+    early_stop = EARLY_STOP_CHECKS.get(q["key"])
+    if early_stop is not None:
+        stop_message = early_stop(val)
+        if stop_message:
+            st.error(stop_message)
+            st.stop()
 
 col1, _ = st.columns([1, 1])
 if col1.button("Save answers"):
@@ -514,10 +729,10 @@ if st.session_state.step == steps_total - 1:
     witnesses_details = answers.get("witnesses_details")
     student_voice_heard_details = answers.get("student_voice_heard_details")
 
-    background_summary_lines = compute_background_summary(answers)
+    background_summary_lines = _cached_background_summary(tuple(sorted(answers.items())))
     st.subheader("Background summary")
-    for line in background_summary_lines:
-        st.markdown(f"- {line}")
+    # One markdown element instead of one protocol message per line.
+    st.markdown("\n".join(f"- {line}" for line in background_summary_lines))
     background_summary_text = "\n".join(background_summary_lines)
 
     stage = answers.get("stage")
@@ -530,15 +745,24 @@ if st.session_state.step == steps_total - 1:
     exclusion_date = answers.get("exclusion_date")
     exclusion_letter_date = answers.get("exclusion_letter_date")
 
-    # "Submit" button demonstrating you can now process/store/send the data
-    if st.button("Submit all data"):
+    # "Submit" button demonstrating you can now process/store/send the data.
+    # The expensive pipeline is guarded by an explicit run_complete flag so a
+    # duplicate click cannot re-run the LLM and LaTeX work by accident; the
+    # flag is set by _finalize_position_statement and cleared below when the
+    # user asks for a fresh run.
+    submitted = st.button("Submit all data")
+    if submitted and st.session_state.get("run_complete"):
+        st.session_state["run_complete"] = False
+        st.info("This submission has already been processed — click again to regenerate.")
+        submitted = False
+    if submitted:
         st.session_state.pop("clarification_state", None)
         st.session_state.pop("position_workflow", None)
         for session_key in list(st.session_state.keys()):
             if session_key.startswith("clarification_answer_"):
                 del st.session_state[session_key]
 
-        school_facts, exclusion_reason, student_perspective = extract_all(
+        school_facts, exclusion_reason, student_perspective = _cached_extract_all(
             exclusion_letter_content,
             school_version_events,
             school_evidence,
@@ -548,10 +772,12 @@ if st.session_state.step == steps_total - 1:
             student_voice_heard_details,
         )
 
-        st.success("Summaries extracted.")
-        st.success(f"School facts: {school_facts}")
-        st.success(f"Exclusion reason: {exclusion_reason}")
-        st.success(f"Student perspective: {student_perspective}")
+        st.success(
+            "Summaries extracted.\n\n"
+            f"School facts: {school_facts}\n\n"
+            f"Exclusion reason: {exclusion_reason}\n\n"
+            f"Student perspective: {student_perspective}"
+        )
 
         st.session_state["extracted_summaries"] = {
             "school_facts": school_facts,
@@ -568,25 +794,8 @@ if st.session_state.step == steps_total - 1:
 
         other_info_text = other_information_provided
 
-        exclusion_date_value = exclusion_date
-        if isinstance(exclusion_date_value, datetime):
-            exclusion_date_value = exclusion_date_value.date()
-        if isinstance(exclusion_date_value, date):
-            exclusion_date_text = exclusion_date_value.strftime("%d %B %Y")
-        elif isinstance(exclusion_date_value, str):
-            exclusion_date_text = exclusion_date_value
-        else:
-            exclusion_date_text = ""
-
-        exclusion_letter_date_value = exclusion_letter_date
-        if isinstance(exclusion_letter_date_value, datetime):
-            exclusion_letter_date_value = exclusion_letter_date_value.date()
-        if isinstance(exclusion_letter_date_value, date):
-            exclusion_letter_date_text = exclusion_letter_date_value.strftime("%d %B %Y")
-        elif isinstance(exclusion_letter_date_value, str):
-            exclusion_letter_date_text = exclusion_letter_date_value
-        else:
-            exclusion_letter_date_text = ""
+        exclusion_date_text = _fmt_uk_date(exclusion_date)
+        exclusion_letter_date_text = _fmt_uk_date(exclusion_letter_date)
 
         if stage == "Independent Review Panel":
             specific_instructions = (
@@ -597,17 +806,11 @@ if st.session_state.step == steps_total - 1:
         else:
             specific_instructions = ""
 
-        grounds_path = (
-            Path("documents/irp_arguments.json") if stage == "Independent Review Panel"
-            else Path("documents/governors_panel_arguments.json")
-        )
-        try:
-            position_statement_grounds = grounds_path.read_text(encoding="utf-8")
-        except FileNotFoundError:
-            position_statement_grounds = "{}"
-            st.warning(f"Could not load position statement grounds from {grounds_path}. Using empty JSON object.")
+        position_statement_grounds, missing_grounds_path = _load_grounds(stage)
+        if missing_grounds_path is not None:
+            st.warning(f"Could not load position statement grounds from {missing_grounds_path}. Using empty JSON object.")
 
-        position_statement, guidance_context = generate_position_statement(
+        position_statement, guidance_context = _cached_generate_position_statement(
             exclusion_reason=exclusion_reason,
             school_facts=school_facts,
             student_perspective=student_perspective,
@@ -620,10 +823,15 @@ if st.session_state.step == steps_total - 1:
         )
 
         try:
-            position_payload = extract_json_from_response(position_statement)
+            position_payload = _parse_position(position_statement)
         except ValueError as exc:
             st.error(f"Could not parse the position statement JSON: {exc}")
             st.stop()
+        # Fail fast on structurally unusable output before any LaTeX work:
+        # the renderer and the clarification flow both require a grounds dict.
+        if not isinstance(position_payload, dict) or "grounds" not in position_payload:
+            st.error("The position statement response did not include valid grounds.")
+            st.stop()
 
         serialised_answers = _serialise_answers(answers)
 
@@ -761,24 +969,28 @@ if st.session_state.step == steps_total - 1:
         if "extracted_summaries" in st.session_state:
             st.subheader("Extracted Summaries")
             summaries = st.session_state["extracted_summaries"]
-            st.success(f"School facts: {summaries['school_facts']}")
-            st.success(f"Exclusion reason: {summaries['exclusion_reason']}")
-            st.success(f"Student perspective: {summaries['student_perspective']}")
+            st.success(
+                f"School facts: {summaries['school_facts']}\n\n"
+                f"Exclusion reason: {summaries['exclusion_reason']}\n\n"
+                f"Student perspective: {summaries['student_perspective']}"
+            )
         
         st.subheader("Generated Position Statement")
         
-        # Display the stored PDF data
-        if "latest_pdf_bytes" in st.session_state and "latest_pdf_name" in st.session_state:
-            existing_run_id = st.session_state["latest_run"]["run_id"]
-            st.download_button(
-                label="Download Position Statement PDF",
-                data=st.session_state["latest_pdf_bytes"],
-                file_name=st.session_state["latest_pdf_name"],
-                mime="application/pdf",
-                key=f"download_cached_pdf_{existing_run_id}",
-            )
-            
-            st.caption(f"PDF: {st.session_state['latest_pdf_name']}")
+        # Re-read the PDF from disk only when the button is rendered
+        if "latest_pdf_path" in st.session_state and "latest_pdf_name" in st.session_state:
+            latest_pdf_path = Path(st.session_state["latest_pdf_path"])
+            if latest_pdf_path.exists():
+                existing_run_id = st.session_state["latest_run"]["run_id"]
+                st.download_button(
+                    label="Download Position Statement PDF",
+                    data=latest_pdf_path.read_bytes(),
+                    file_name=st.session_state["latest_pdf_name"],
+                    mime="application/pdf",
+                    key=f"download_cached_pdf_{existing_run_id}",
+                )
+
+                st.caption(f"PDF: {st.session_state['latest_pdf_name']}")
         
         # Display the stored JSON payload for debugging
         if "latest_json_payload" in st.session_state:
@@ -795,56 +1007,6 @@ if st.session_state.step == steps_total - 1:
             st.subheader("User Details (for debugging)")
             st.json(st.session_state["latest_user_details"])
         
-        # Display the review form
-        st.subheader("Reviewer Evaluation")
-        with st.form("evaluation_form"):
-            run_id = st.session_state["latest_run"]["run_id"]
-            st.markdown(f"Run ID: `{run_id}`")
-            
-            # Reviewer information
-            st.markdown("**Reviewer Information**")
-            reviewer_name = st.text_input("Your name", placeholder="Enter your full name")
-            reviewer_email = st.text_input("Your email", placeholder="Enter your email address")
-            
-            st.markdown("**Evaluation Scores**")
-            accuracy_score = st.slider("Accuracy of factual content", 0, 10, 5)
-            relevance_score = st.slider("Relevance of arguments", 0, 10, 5)
-            writing_score = st.slider("Writing style and clarity", 0, 10, 5)
-            presentation_score = st.slider("Presentation of document", 0, 10, 5)
-            ease_score = st.slider("Ease of using this tool", 0, 10, 5)
-            reviewer_remarks = st.text_area("Additional comments or specific issues", height=120)
-            submitted_feedback = st.form_submit_button("Submit feedback")
-
-        if submitted_feedback:
-            # Use UK timezone instead of UTC
-            uk_tz = pytz.timezone('Europe/London')
-            timestamp_uk = datetime.now(uk_tz).isoformat()
-            summaries = st.session_state.get("extracted_summaries") or {}
-            position_payload_state = st.session_state.get("latest_json_payload")
-            feedback_payload = {
-                "run_id": run_id,
-                "timestamp_utc": timestamp_uk,  # Note: keeping field name as timestamp_utc for compatibility
-                "reviewer_name": reviewer_name,
-                "reviewer_email": reviewer_email,
-                "stage": st.session_state["latest_run"]["stage"],
-                "accuracy": accuracy_score,
-                "relevance": relevance_score,
-                "writing_style": writing_score,
-                "presentation": presentation_score,
-                "ease_of_use": ease_score,
-                "remarks": reviewer_remarks,
-                "pdf_filename": st.session_state["latest_run"]["pdf_filename"],
-                "school_facts_llm": summaries.get("school_facts", ""),
-                "exclusion_reason_llm": summaries.get("exclusion_reason", ""),
-                "student_perspective_llm": summaries.get("student_perspective", ""),
-                "position_statement_json_llm": json.dumps(position_payload_state) if position_payload_state else "",
-            }
-            st.write("Feedback payload:", feedback_payload)
-
-            try:
-                append_feedback_to_sheet(feedback_payload)
-            except Exception as exc:  # pragma: no cover - runtime feedback
-                st.error(f"Could not record feedback: {exc}")
-            else:
-                st.success("Feedback recorded successfully.")
-                st.balloons()
+        # Display the review form; interactions inside it rerun only the
+        # fragment, not the whole script.
+        _render_evaluation_form()
@@ -1,8 +1,14 @@
+import functools
 import json
 import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter, Retry
 
 from rag_index import GuidanceRetriever, format_behaviour_block, format_suspensions_block
 from vox_helpers import (
@@ -22,6 +28,12 @@ try:
     OPENAI_TIMEOUT = float(os.getenv("OPENAI_API_TIMEOUT", "240"))
 except ValueError:
     OPENAI_TIMEOUT = 120.0
+# Separate connect timeout: a dead endpoint fails in seconds while a slow
+# generation still gets the full read window.
+try:
+    CONNECT_TIMEOUT = float(os.getenv("OPENAI_API_CONNECT_TIMEOUT", "5"))
+except ValueError:
+    CONNECT_TIMEOUT = 5.0
 
 try:
     import streamlit as st  # type: ignore
@@ -29,6 +41,17 @@ try:
 except ImportError:  # pragma: no cover
     HAS_STREAMLIT = False
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps  # returns bytes
+except ImportError:  # pragma: no cover
+    _json_loads = json.loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
 
 system_messages = {
     "extract_school_facts": (
@@ -56,17 +79,64 @@ system_messages = {
         "Identify assumptions, request targeted clarifications, and update the grounds with only verified information."
     ),
 }
+system_messages = {name: sys.intern(message) for name, message in system_messages.items()}
+
+# One frozen message object per system prompt, so call_llm reuses it instead
+# of allocating a fresh role/content dict per call.
+_SYSTEM_MESSAGE_OBJECTS = {
+    message: {"role": "system", "content": message}
+    for message in system_messages.values()
+}
+
+# Shared session so LLM calls reuse pooled keep-alive connections instead of
+# paying DNS + TCP + TLS per request; sized for the concurrent extract_all
+# path. allowed_methods=None lets the 429/5xx retries apply to POSTs, the
+# same policy the provider SDKs use.
+_HTTP = requests.Session()
+_HTTP.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=None,
+        ),
+    ),
+)
 
 _guidance_retriever = None
+_guidance_retriever_lock = threading.Lock()
 
 
 def get_guidance_retriever():
     global _guidance_retriever
     if _guidance_retriever is None:
-        _guidance_retriever = GuidanceRetriever()
+        # Double-checked so concurrent first calls (e.g. from the parallel
+        # extract path) cannot build the retriever twice.
+        with _guidance_retriever_lock:
+            if _guidance_retriever is None:
+                _guidance_retriever = GuidanceRetriever()
     return _guidance_retriever
 
 
+def _warm_guidance_retriever():
+    try:
+        retriever = get_guidance_retriever()
+        retriever.behaviour_index
+        retriever.suspensions_index
+    except Exception:
+        # Warming is best-effort; the first real search surfaces any error.
+        pass
+
+
+# Load the guidance indices off the critical path so the first user request
+# does not pay the corpus-load/index-build cost.
+threading.Thread(target=_warm_guidance_retriever, daemon=True).start()
+
+
 def call_llm_ollama(system_message, prompt):
     """Call Ollama chat endpoint with a simple system/user payload."""
     api_key = _get_ollama_api_key()
@@ -84,21 +154,34 @@ def call_llm_ollama(system_message, prompt):
         "temperature": 0.2,
     }
 
-    response = requests.post(OLLAMA_API_URL, headers=headers, json=payload, timeout=60)
+    response = _HTTP.post(
+        OLLAMA_API_URL,
+        headers=headers,
+        data=_json_dumps(payload),
+        stream=True,
+        timeout=(CONNECT_TIMEOUT, 60),
+    )
     response.raise_for_status()
-    text = response.json()["message"]["content"]
+    text = _json_loads(b"".join(response.iter_content(65536)))["message"]["content"]
     return text
 
 
-def call_llm(system_message, prompt):
-    """Call the OpenAI Responses API with the provided prompt."""
+def call_llm(system_message, prompt, cache_key=None):
+    """Call the OpenAI Responses API with the provided prompt.
+
+    ``cache_key`` is passed through as ``prompt_cache_key`` so repeat calls
+    with a shared prompt prefix (e.g. clarification rounds over the same
+    answers) are routed to the same prefix-cache shard."""
     api_key = _get_openai_api_key()
     reasoning_effort = os.getenv("OPENAI_REASONING_EFFORT", "low")
     text_verbosity = os.getenv("OPENAI_TEXT_VERBOSITY", "medium")
 
     conversation = []
     if system_message:
-        conversation.append({"role": "system", "content": system_message})
+        conversation.append(
+            _SYSTEM_MESSAGE_OBJECTS.get(system_message)
+            or {"role": "system", "content": system_message}
+        )
     conversation.append({"role": "user", "content": prompt})
 
     headers = {
@@ -111,22 +194,28 @@ def call_llm(system_message, prompt):
         "reasoning": {"effort": reasoning_effort},
         "text": {"verbosity": text_verbosity},
     }
+    if cache_key:
+        payload["prompt_cache_key"] = cache_key
 
     try:
-        response = requests.post(
+        response = _HTTP.post(
             OPENAI_API_URL,
             headers=headers,
-            json=payload,
-            timeout=OPENAI_TIMEOUT,
+            data=_json_dumps(payload),
+            stream=True,
+            timeout=(CONNECT_TIMEOUT, OPENAI_TIMEOUT),
         )
+        if response.status_code >= 400:
+            _raise_openai_error(response)
+        # Stream the body in chunks rather than letting requests buffer it
+        # wholesale before parsing.
+        body = b"".join(response.iter_content(65536))
     except requests.Timeout as exc:
         raise RuntimeError(
-            f"OpenAI request timed out after {OPENAI_TIMEOUT} seconds. "
+            f"OpenAI request timed out (connect {CONNECT_TIMEOUT}s, read {OPENAI_TIMEOUT}s). "
             "Try reducing the prompt size or increase OPENAI_API_TIMEOUT."
         ) from exc
-    if response.status_code >= 400:
-        _raise_openai_error(response)
-    data = response.json()
+    data = _json_loads(body)
     text = _extract_text_from_responses_output(data)
     if not text:
         raise RuntimeError("OpenAI responses API returned an empty result.")
@@ -179,25 +268,36 @@ def _raise_openai_error(response):
         f"{message.strip() if isinstance(message, str) else message}"
     )
 
-def build_prompt(template_filename, **template_context):
-    """Load a prompt template and interpolate the provided variables."""
-    template_path = PROMPTS_DIR / template_filename
-    template_text = template_path.read_text(encoding="utf-8")
-    context = _normalise_context(template_context)
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
 
-    # Protect placeholder tokens before escaping braces in the template.
-    placeholder_tokens = {}
-    for key in context.keys():
-        token = f"__PLACEHOLDER_{key.upper()}__"
-        placeholder_tokens[f"{{{key}}}"] = token
-        template_text = template_text.replace(f"{{{key}}}", token)
+@functools.lru_cache(maxsize=32)
+def _load_template(template_filename):
+    """Read a prompt template from the prompts directory.
 
-    template_text = template_text.replace("{", "{{").replace("}", "}}")
+    Templates never change at runtime, so each file is read from disk once
+    per process instead of once per LLM call."""
+    return (PROMPTS_DIR / template_filename).read_text(encoding="utf-8")
 
-    for original, token in placeholder_tokens.items():
-        template_text = template_text.replace(token, original)
 
-    return template_text.format(**context)
+def build_prompt(template_filename, template_text=None, **template_context):
+    """Load a prompt template and interpolate the provided variables.
+
+    ``template_text`` lets callers that have already loaded (or prefetched)
+    the template skip the disk read.
+    """
+    if template_text is None:
+        template_text = _load_template(template_filename)
+    context = _normalise_context(template_context)
+
+    # Substitute {name} placeholders for known context keys in a single pass;
+    # any other braces (e.g. JSON examples in the template) pass through
+    # verbatim, so no escape/unescape round trips are needed.
+    def _substitute(match):
+        value = context.get(match.group(1))
+        return value if value is not None else match.group(0)
+
+    return _PLACEHOLDER_RE.sub(_substitute, template_text)
 
 
 def extract_school_facts(exclusion_letter_content, school_version_events, school_evidence):
@@ -233,15 +333,31 @@ def extract_student_perspective(student_agrees_with_school, student_version_even
 
 
 def extract_all(exclusion_letter_content, school_version_events, school_evidence, student_agrees_with_school, student_version_events, witnesses_details, student_voice_heard_details):
-    school_facts = extract_school_facts(exclusion_letter_content, school_version_events, school_evidence)
-    exclusion_reason = extract_exclusion_reason(exclusion_letter_content)
-    student_perspective = extract_student_perspective(
-        student_agrees_with_school,
-        student_version_events,
-        witnesses_details,
-        student_voice_heard_details,
-    )
-    return school_facts, exclusion_reason, student_perspective
+    # The three extractions share no data, so run them concurrently and pay
+    # only for the slowest LLM round trip instead of the sum of all three.
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        school_facts_future = executor.submit(
+            extract_school_facts,
+            exclusion_letter_content,
+            school_version_events,
+            school_evidence,
+        )
+        exclusion_reason_future = executor.submit(
+            extract_exclusion_reason,
+            exclusion_letter_content,
+        )
+        student_perspective_future = executor.submit(
+            extract_student_perspective,
+            student_agrees_with_school,
+            student_version_events,
+            witnesses_details,
+            student_voice_heard_details,
+        )
+        return (
+            school_facts_future.result(),
+            exclusion_reason_future.result(),
+            student_perspective_future.result(),
+        )
 
 
 def build_guidance_context(exclusion_reason, school_facts, student_perspective, background_summary, stage_info, other_information_provided, exclusion_letter_date, specific_instructions, behaviour_top_k = 4, suspensions_top_k = 6):
@@ -276,19 +392,27 @@ def build_guidance_context(exclusion_reason, school_facts, student_perspective,
 
 
 def generate_position_statement(exclusion_reason, school_facts, student_perspective, background_summary, stage_info, other_information_provided, exclusion_letter_date, specific_instructions, position_statement_grounds):
-    guidance_context = build_guidance_context(
-        exclusion_reason=exclusion_reason,
-        school_facts=school_facts,
-        student_perspective=student_perspective,
-        background_summary=background_summary,
-        stage_info=stage_info,
-        other_information_provided=other_information_provided,
-        exclusion_letter_date=exclusion_letter_date,
-        specific_instructions=specific_instructions,
-    )
+    # Guidance retrieval and the template read are independent, so overlap
+    # them rather than paying for the retrieval before touching the disk.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        guidance_future = executor.submit(
+            build_guidance_context,
+            exclusion_reason=exclusion_reason,
+            school_facts=school_facts,
+            student_perspective=student_perspective,
+            background_summary=background_summary,
+            stage_info=stage_info,
+            other_information_provided=other_information_provided,
+            exclusion_letter_date=exclusion_letter_date,
+            specific_instructions=specific_instructions,
+        )
+        template_future = executor.submit(_load_template, "create_position_statement.txt")
+        guidance_context = guidance_future.result()
+        template_text = template_future.result()
 
     prompt = build_prompt(
         "create_position_statement.txt",
+        template_text=template_text,
         exclusion_reason=exclusion_reason,
         school_facts=school_facts,
         student_perspective=student_perspective,
@@ -303,7 +427,7 @@ def generate_position_statement(exclusion_reason, school_facts, student_perspect
     )
 
     system_message = system_messages["generate_position_statement"]
-    position_statement = call_llm(system_message, prompt)
+    position_statement = call_llm(system_message, prompt, cache_key="vox-position-statement")
 
     # Log guidance context for audit purposes.
     print("=== Guidance Context: Behaviour in Schools ===")
@@ -315,10 +439,14 @@ def generate_position_statement(exclusion_reason, school_facts, student_perspect
 
 
 def _build_clarification_prompt(mode, user_answers, position_statement, clarification_responses):
-    """Serialise context consistently for clarification prompts."""
-    user_answers_json = json.dumps(user_answers, ensure_ascii=True, indent=2, sort_keys=True)
-    position_statement_json = json.dumps(position_statement, ensure_ascii=True, indent=2, sort_keys=True)
-    clarification_responses_json = json.dumps(clarification_responses or [], ensure_ascii=True, indent=2)
+    """Serialise context consistently for clarification prompts.
+
+    Compact separators, no indent and no key sort: the model parses the JSON
+    either way, and pretty-printing tripled the serialised size of the
+    position statement on every clarification round."""
+    user_answers_json = _json_dumps(user_answers).decode("utf-8")
+    position_statement_json = _json_dumps(position_statement).decode("utf-8")
+    clarification_responses_json = _json_dumps(clarification_responses or []).decode("utf-8")
 
     return build_prompt(
         "clarification.txt",
@@ -338,7 +466,7 @@ def generate_clarification_questions(user_answers, position_statement):
         position_statement=position_statement,
         clarification_responses=[],
     )
-    return call_llm(system_message, prompt)
+    return call_llm(system_message, prompt, cache_key="vox-clarification")
 
 
 def update_position_statement_with_clarifications(user_answers, position_statement, clarification_responses):
@@ -350,4 +478,4 @@ def update_position_statement_with_clarifications(user_answers, position_stateme
         position_statement=position_statement,
         clarification_responses=clarification_responses,
     )
-    return call_llm(system_message, prompt)
+    return call_llm(system_message, prompt, cache_key="vox-clarification")
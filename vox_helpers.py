@@ -1,3 +1,4 @@
+import functools
 import os
 
 try:
@@ -6,64 +7,92 @@ try:
 except ImportError:
     HAS_STREAMLIT = False
 
+# Declarative tables driving compute_background_summary: yes/no flags map to
+# a pair of fixed sentences, detail fields to a present-template and an
+# absent message. New background fields only need a table row.
+_YES_NO_FIELDS = (
+    (
+        "is_send",
+        "Young person has SEND.",
+        "Young person does NOT have SEND.",
+    ),
+    (
+        "is_ethnic_minority",
+        "Young person is from ethnic minority background.",
+        "Young person is NOT from ethnic minority background.",
+    ),
+)
+
+# Detail fields shown only when the young person has SEND.
+_SEND_DETAIL_FIELDS = (
+    ("send_details", "SEND Details"),
+    ("ehcp_details", "EHCP Details"),
+)
+
+_DETAIL_FIELDS = (
+    (
+        "previous_suspensions_details",
+        "Previous suspensions: {}.",
+        "No previous suspensions mentioned.",
+    ),
+    (
+        "family_awareness_details",
+        "Family awareness of behavioural issues, or the risk of exclusion before it happened: {}.",
+        "No family awareness of behavioural issues, or the risk of exclusion before it happened details provided.",
+    ),
+    (
+        "personal_issues_details",
+        "Personal issues: {}.",
+        "No personal issues mentioned.",
+    ),
+)
+
+
+def _yes(responses, key):
+    return str(responses.get(key, "")).strip().lower() == "yes"
+
+
+def _detail(responses, key):
+    return (responses.get(key) or "").strip()
+
+
 def compute_background_summary(responses):
     """Build a background summary list similar to the front-end helper."""
     summary = []
 
-    is_send = str(responses.get("is_send", "")).strip().lower() == "yes"
-    send_details = (responses.get("send_details") or "").strip()
-    ehcp_details = (responses.get("ehcp_details") or "").strip()
-    is_ethnic_minority = str(responses.get("is_ethnic_minority", "")).strip().lower() == "yes"
-    previous_suspensions_details = (responses.get("previous_suspensions_details") or "").strip()
-    family_awareness_details = (responses.get("family_awareness_details") or "").strip()
-    personal_issues_details = (responses.get("personal_issues_details") or "").strip()
-
-    if is_send:
-        summary.append("Young person has SEND.")
-        if send_details:
-            summary.append(f"SEND Details: {send_details}.")
-        if ehcp_details:
-            summary.append(f"EHCP Details: {ehcp_details}.")
+    send_flag, ethnicity_flag = _YES_NO_FIELDS
+    if _yes(responses, send_flag[0]):
+        summary.append(send_flag[1])
+        for key, label in _SEND_DETAIL_FIELDS:
+            detail = _detail(responses, key)
+            if detail:
+                summary.append(f"{label}: {detail}.")
     else:
-        summary.append("Young person does NOT have SEND.")
+        summary.append(send_flag[2])
 
-    if is_ethnic_minority:
-        summary.append("Young person is from ethnic minority background.")
-    else:
-        summary.append("Young person is NOT from ethnic minority background.")
+    summary.append(ethnicity_flag[1] if _yes(responses, ethnicity_flag[0]) else ethnicity_flag[2])
 
-    if previous_suspensions_details:
-        summary.append(f"Previous suspensions: {previous_suspensions_details}.")
-    else:
-        summary.append("No previous suspensions mentioned.")
-
-    if family_awareness_details:
-        summary.append(
-            "Family awareness of behavioural issues, or the risk of exclusion before it happened: "
-            f"{family_awareness_details}."
-        )
-    else:
-        summary.append(
-            "No family awareness of behavioural issues, or the risk of exclusion before it happened details provided."
-        )
-
-    if personal_issues_details:
-        summary.append(f"Personal issues: {personal_issues_details}.")
-    else:
-        summary.append("No personal issues mentioned.")
+    for key, present_template, absent_message in _DETAIL_FIELDS:
+        detail = _detail(responses, key)
+        summary.append(present_template.format(detail) if detail else absent_message)
 
     return summary
 
+@functools.lru_cache(maxsize=1)
 def _get_ollama_api_key():
     """Load the Ollama API key from environment variables or Streamlit secrets."""
     api_key = os.getenv("OLLAMA_API_KEY")
     if api_key:
         return api_key
-        
-    OLLAMA_API_KEY = st.secrets["ollama"]["api_key"]
-    if OLLAMA_API_KEY:
-        return OLLAMA_API_KEY
-        
+
+    if HAS_STREAMLIT:
+        try:
+            section_key = st.secrets["ollama"]["api_key"]
+        except Exception:
+            section_key = None
+        if section_key:
+            return section_key
+
     if HAS_STREAMLIT and "ollama_api_key" in st.secrets:
         secret_value = st.secrets["ollama_api_key"]
         if isinstance(secret_value, str):
@@ -74,6 +103,7 @@ def _get_ollama_api_key():
         "or define st.secrets['ollama_api_key']."
     )
 
+@functools.lru_cache(maxsize=1)
 def _get_openai_api_key():
     """Load the OpenAI API key from environment variables or Streamlit secrets."""
     api_key = os.getenv("OPENAI_API_KEY")
@@ -102,25 +132,22 @@ def _get_openai_api_key():
     )
 
 def _normalise_context(context):
-    """Ensure all prompt variables are strings to keep str.format happy."""
-    normalised = {}
-    for key, value in context.items():
-        if value is None:
-            normalised[key] = "Not provided"
-        else:
-            normalised[key] = str(value)
-    return normalised
-
-
-def _compose_guidance_query(exclusion_reason, school_facts, student_perspective, background_summary, stage_info, other_information_provided, exclusion_letter_date, specific_instructions):
-    parts = [
-        exclusion_reason,
-        school_facts,
-        student_perspective,
-        background_summary,
-        stage_info,
-        other_information_provided,
-        exclusion_letter_date,
-        specific_instructions,
-    ]
-    return "\n\n".join(part.strip() for part in parts if part and part.strip())
+    """Ensure all prompt variables are strings for placeholder substitution.
+
+    Almost every caller already passes strings, so the exact-type check skips
+    the redundant str() copy on that common path."""
+    return {
+        key: "Not provided" if value is None else value if type(value) is str else str(value)
+        for key, value in context.items()
+    }
+
+
+def _compose_guidance_query(*parts):
+    """Join the non-empty parts with blank lines, stripping each one once."""
+    cleaned = []
+    for part in parts:
+        if part:
+            stripped = part.strip()
+            if stripped:
+                cleaned.append(stripped)
+    return "\n\n".join(cleaned)